@@ -12,8 +12,6 @@
 Hook that loads defines all the available actions, broken down by publish type. 
 """
 import os
-import re
-import glob
 import sys
 
 import sgtk
@@ -282,47 +280,15 @@ class NukeActions(HookBaseClass):
         file.0001.jpg, or file_001.jpg. We also check for input file names with
         abstracted frame number tokens, such as file.####.jpg, or file.%04d.jpg.
 
+        This uses the app's utils so that only the names in the sequence's
+        folder are looked at, without stat-ing every frame on disk.
+
         :param str path: The file path to parse.
 
         :returns: None if no range could be determined, otherwise (min, max)
         :rtype: tuple or None
         """
-        # This pattern will match the following at the end of a string and
-        # retain the frame number or frame token as group(1) in the resulting
-        # match object:
-        #
-        # 0001
-        # ####
-        # %04d
-        #
-        # The number of digits or hashes does not matter; we match as many as
-        # exist.
-        frame_pattern = re.compile(r"([0-9#]+|[%]0\dd)$")
-        root, ext = os.path.splitext(path)
-        match = re.search(frame_pattern, root)
-
-        # If we did not match, we don't know how to parse the file name, or there
-        # is no frame number to extract.
-        if not match:
-            return None
-
-        # We need to get all files that match the pattern from disk so that we
-        # can determine what the min and max frame number is.
-        glob_path = "%s%s" % (
-            re.sub(frame_pattern, "*", root),
-            ext,
-        )
-        files = glob.glob(glob_path)
-
-        # Our pattern from above matches against the file root, so we need
-        # to chop off the extension at the end.
-        file_roots = [os.path.splitext(f)[0] for f in files]
-
-        # We know that the search will result in a match at this point, otherwise
-        # the glob wouldn't have found the file. We can search and pull group 1
-        # to get the integer frame number from the file root name.
-        frames = [int(re.search(frame_pattern, f).group(1)) for f in file_roots]
-        return (min(frames), max(frames))
+        return self.parent.utils.sequence_range_from_path(path)
 
     def _find_sequence_range(self, path):
         """
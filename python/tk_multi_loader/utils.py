@@ -9,14 +9,44 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 
-import glob
 import os
 import re
+from collections import OrderedDict, deque
 
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 from sgtk import TankError
 
+# This pattern will match the following at the end of a string and
+# retain the frame number or frame token as group(1) in the resulting
+# match object:
+#
+# 0001
+# ####
+# %04d
+#
+# The number of digits or hashes does not matter; we match as many as
+# exist.
+_FRAME_PATTERN = re.compile(r"([0-9#]+|[%]0\dd)$")
+
+# Matches the %d style frame spec a SEQ template key resolves to when
+# given a "FORMAT: %d" value, such as %04d or %d.
+_FRAME_SPEC_PATTERN = re.compile(r"%(0\d+)?d")
+
+# Types of the strings context tokens can be given as in filters.
+try:
+    _STRING_TYPES = basestring
+except NameError:
+    _STRING_TYPES = str
+
+# Event type checked by ResizeEventFilter for every event it sees.
+_RESIZE_EVENT = QtCore.QEvent.Resize
+
+# The folder graphic that folder thumbnails are composited onto. This is a
+# static resource, so it is loaded once on first use rather than decoded
+# again for every thumbnail, see create_overlayed_folder_thumbnail().
+_FOLDER_BASE_IMAGE = None
+
 
 class ResizeEventFilter(QtCore.QObject):
     """
@@ -43,6 +73,15 @@ class ResizeEventFilter(QtCore.QObject):
     """
     resized = QtCore.Signal()
 
+    def __init__(self, parent=None):
+        """
+        :param parent: Parent object, typically the widget being watched.
+        """
+        super(ResizeEventFilter, self).__init__(parent)
+        # the filter sees every single event of the watched widget, so keep
+        # the lookups it has to do for each of them to a minimum.
+        self._emit_resized = self.resized.emit
+
     def eventFilter(self, obj, event):
         """
         Event filter implementation.
@@ -58,40 +97,179 @@ class ResizeEventFilter(QtCore.QObject):
                   should ever be discarded by the filter.
         """
         # peek at the message
-        if event.type() == QtCore.QEvent.Resize:
+        if event.type() == _RESIZE_EVENT:
             # re-broadcast any resize events
-            self.resized.emit()
+            self._emit_resized()
         # pass it on!
         return False
 
 
+class _LRUCache(object):
+    """
+    Small least-recently-used cache for the painting helpers below.
+    """
+
+    def __init__(self, max_size):
+        """
+        :param int max_size: Maximum number of values to hold on to.
+        """
+        self._max_size = max_size
+        self._values = OrderedDict()
+
+    def get(self, key):
+        """
+        Returns the value stored for the given key.
+
+        :param key: Hashable key.
+        :returns: The cached value or None if nothing is cached for the key.
+        """
+        value = self._values.pop(key, None)
+        if value is not None:
+            # re-insert to mark it as the most recently used entry
+            self._values[key] = value
+        return value
+
+    def add(self, key, value):
+        """
+        Stores a value, evicting the least recently used
+        entries if the cache is full.
+
+        :param key: Hashable key.
+        :param value: Value to cache.
+        """
+        self._values[key] = value
+        while len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+
+
+# The publish history model gives every row the same "loading" composite
+# before its real thumbnails arrive, so keep hold of that rather than scaling
+# and painting it again for each row. Entries are keyed by the cacheKey() of
+# the source pixmaps. Real thumbnails arrive as new pixmaps every time and
+# never hit, so only a handful of entries are needed.
+_USER_PUBLISH_THUMBNAIL_CACHE = _LRUCache(4)
+
+# rounded outlines keyed by (width, height, corner radius), see
+# _rounded_rect_path().
+_ROUNDED_RECT_PATHS = _LRUCache(64)
+
+# notifiers for the sequence scans started by sequence_range_from_path_async()
+# which have not reported back yet.
+_PENDING_SEQUENCE_SCANS = set()
+
+
+def _scale_thumbnail(thumb, width, height):
+    """
+    Scales a thumbnail down to fit inside the given size, keeping its
+    aspect ratio.
+
+    Shotgun thumbnails are often a lot bigger than what we display, so large
+    images are first shrunk to twice the requested size using the cheap
+    nearest neighbour filter. The expensive smooth filter then only has to
+    run over a fraction of the original pixels.
+
+    :param thumb: QPixmap or QImage to scale.
+    :param int width: Maximum width of the scaled thumbnail.
+    :param int height: Maximum height of the scaled thumbnail.
+    :returns: Scaled object of the same type as the input.
+    """
+    thumb_width = thumb.width()
+    thumb_height = thumb.height()
+
+    # if the thumbnail already fills the box along one side, scaling would
+    # not change it, so skip the filtering pass altogether.
+    if ((thumb_width == width and thumb_height <= height) or
+            (thumb_height == height and thumb_width <= width)):
+        return thumb
+
+    if thumb_width > width * 2 or thumb_height > height * 2:
+        thumb = thumb.scaled(width * 2,
+                             height * 2,
+                             QtCore.Qt.KeepAspectRatio,
+                             QtCore.Qt.FastTransformation)
+
+    return thumb.scaled(width,
+                        height,
+                        QtCore.Qt.KeepAspectRatio,
+                        QtCore.Qt.SmoothTransformation)
+
+
+def _rounded_rect_path(width, height, radius):
+    """
+    Returns a rounded rectangle path with its top left corner at the origin.
+
+    Recently used paths are kept and reused, so the corner arcs don't have
+    to be worked out again for every thumbnail of the same size.
+
+    :param int width: Width of the rectangle.
+    :param int height: Height of the rectangle.
+    :param int radius: Radius of the rounded corners.
+    :returns: QPainterPath
+    """
+    key = (width, height, radius)
+    path = _ROUNDED_RECT_PATHS.get(key)
+    if path is None:
+        path = QtGui.QPainterPath()
+        path.addRoundedRect(0, 0, width, height, radius, radius)
+        _ROUNDED_RECT_PATHS.add(key, path)
+    return path
+
+
+def _draw_rounded_thumbnail(painter, thumb_img, corner_radius):
+    """
+    Draws a thumbnail with rounded corners at the painter's origin.
+
+    Rather than filling a rounded rectangle with a textured brush, the
+    image is blitted straight into a rounded clip region, which avoids
+    the rasterizer's tiled brush code path.
+
+    :param painter: Active QPainter to draw with.
+    :param thumb_img: QImage holding the scaled thumbnail.
+    :param int corner_radius: Radius of the rounded corners.
+    """
+    # note how we have to compensate for the corner radius
+    outline = _rounded_rect_path(thumb_img.width()-corner_radius,
+                                 thumb_img.height()-corner_radius,
+                                 corner_radius)
+
+    painter.setClipPath(outline)
+    painter.drawImage(0, 0, thumb_img)
+    painter.setClipping(False)
+
+    # finally stroke the outline with the current pen. The image blit is
+    # axis aligned so antialiasing is only worth paying for on the curves.
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    painter.drawPath(outline)
+
+
 def create_overlayed_user_publish_thumbnail(publish_pixmap, user_pixmap):
     """
     Creates a sqaure 75x75 thumbnail with an optional overlayed pixmap.
     """
+    cache_key = (
+        publish_pixmap.cacheKey(),
+        user_pixmap.cacheKey() if user_pixmap else 0
+    )
+    base_image = _USER_PUBLISH_THUMBNAIL_CACHE.get(cache_key)
+    if base_image is not None:
+        return base_image
+
     # create a 100x100 base image
     base_image = QtGui.QPixmap(75, 75)
     base_image.fill(QtCore.Qt.transparent)
 
     painter = QtGui.QPainter(base_image)
-    painter.setRenderHint(QtGui.QPainter.Antialiasing)
 
     # scale down the thumb
     if not publish_pixmap.isNull():
         thumb_scaled = publish_pixmap.scaled(
             75, 75,
             QtCore.Qt.KeepAspectRatioByExpanding,
-            QtCore.Qt.SmoothTransformation)
+            QtCore.Qt.FastTransformation)
 
         # now composite the thumbnail on top of the base image
         # bottom align it to make it look nice
-        thumb_img = thumb_scaled.toImage()
-        brush = QtGui.QBrush(thumb_img)
-        painter.save()
-        painter.setBrush(brush)
-        painter.setPen(QtGui.QPen(QtCore.Qt.NoPen))
-        painter.drawRect(0, 0, 75, 75)
-        painter.restore()
+        painter.drawPixmap(0, 0, thumb_scaled, 0, 0, 75, 75)
 
     if user_pixmap and not user_pixmap.isNull():
 
@@ -99,18 +277,14 @@ def create_overlayed_user_publish_thumbnail(publish_pixmap, user_pixmap):
         user_scaled = user_pixmap.scaled(
             30, 30,
             QtCore.Qt.KeepAspectRatioByExpanding,
-            QtCore.Qt.SmoothTransformation)
-        user_img = user_scaled.toImage()
-        user_brush = QtGui.QBrush(user_img)
-        painter.save()
-        painter.translate(42, 42)
-        painter.setBrush(user_brush)
-        painter.setPen(QtGui.QPen(QtCore.Qt.NoPen))
-        painter.drawRect(0, 0, 30, 30)
-        painter.restore()
+            QtCore.Qt.FastTransformation)
+        # the expanded pixmap can be larger than 30x30 so only
+        # blit its top left corner into the overlay area
+        painter.drawPixmap(42, 42, user_scaled, 0, 0, 30, 30)
 
     painter.end()
 
+    _USER_PUBLISH_THUMBNAIL_CACHE.add(cache_key, base_image)
     return base_image
 
 
@@ -135,51 +309,41 @@ def create_overlayed_folder_thumbnail(image):
     MAX_THUMB_WIDTH = 460
     MAX_THUMB_HEIGHT = 280
 
+    global _FOLDER_BASE_IMAGE
+    if _FOLDER_BASE_IMAGE is None:
+        _FOLDER_BASE_IMAGE = QtGui.QImage(":/res/folder_512x400.png").convertToFormat(
+            QtGui.QImage.Format_ARGB32_Premultiplied)
+
     # looks like there are some pyside related memory issues here relating to
     # referencing a resource and then operating on it. Just to be sure, make
-    # make a full copy of the resource before starting to manipulate.
-    base_image = QtGui.QPixmap(":/res/folder_512x400.png")
-
-    # now attempt to load the image
-    # pixmap will be a null pixmap if load fails
-    thumb = QtGui.QPixmap.fromImage(image)
+    # make a full copy of the cached resource before starting to manipulate.
+    canvas = _FOLDER_BASE_IMAGE.copy()
 
-    if not thumb.isNull():
+    # image will be null if the thumbnail failed to load
+    if not image.isNull():
 
-        thumb_scaled = thumb.scaled(MAX_THUMB_WIDTH,
-                                    MAX_THUMB_HEIGHT,
-                                    QtCore.Qt.KeepAspectRatio,
-                                    QtCore.Qt.SmoothTransformation)
+        thumb_img = _scale_thumbnail(image,
+                                     MAX_THUMB_WIDTH,
+                                     MAX_THUMB_HEIGHT)
 
         # now composite the thumbnail
-        thumb_img = thumb_scaled.toImage()
-        brush = QtGui.QBrush(thumb_img)
-
-        painter = QtGui.QPainter(base_image)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        painter.setBrush(brush)
+        painter = QtGui.QPainter(canvas)
 
         # figure out the offset height wise in order to center the thumb
-        height_difference = CANVAS_HEIGHT - thumb_scaled.height()
-        width_difference = CANVAS_WIDTH - thumb_scaled.width()
+        height_difference = CANVAS_HEIGHT - thumb_img.height()
+        width_difference = CANVAS_WIDTH - thumb_img.width()
 
-        inlay_offset_w = (width_difference/2)+(CORNER_RADIUS/2)
+        inlay_offset_w = (width_difference//2)+(CORNER_RADIUS//2)
         # add a 30 px offset here to push the image off center to
         # fit nicely inside the folder icon
-        inlay_offset_h = (height_difference/2)+(CORNER_RADIUS/2)+30
+        inlay_offset_h = (height_difference//2)+(CORNER_RADIUS//2)+30
 
-        # note how we have to compensate for the corner radius
         painter.translate(inlay_offset_w, inlay_offset_h)
-        painter.drawRoundedRect(0,
-                                0,
-                                thumb_scaled.width()-CORNER_RADIUS,
-                                thumb_scaled.height()-CORNER_RADIUS,
-                                CORNER_RADIUS,
-                                CORNER_RADIUS)
+        _draw_rounded_thumbnail(painter, thumb_img, CORNER_RADIUS)
 
         painter.end()
 
-    return base_image
+    return QtGui.QPixmap.fromImage(canvas)
 
 
 def create_overlayed_publish_thumbnail(image):
@@ -197,52 +361,40 @@ def create_overlayed_publish_thumbnail(image):
     CANVAS_HEIGHT = 400
     CORNER_RADIUS = 10
 
-    # get the 512 base image
-    base_image = QtGui.QPixmap(CANVAS_WIDTH, CANVAS_HEIGHT)
-    base_image.fill(QtCore.Qt.transparent)
-
-    # now attempt to load the image
-    # pixmap will be a null pixmap if load fails
-    thumb = QtGui.QPixmap.fromImage(image)
+    # get the 512 base image. We paint into a QImage in the format QPainter
+    # prefers and only convert the end result into a pixmap.
+    canvas = QtGui.QImage(CANVAS_WIDTH,
+                          CANVAS_HEIGHT,
+                          QtGui.QImage.Format_ARGB32_Premultiplied)
+    canvas.fill(QtCore.Qt.transparent)
 
-    if not thumb.isNull():
+    # image will be null if the thumbnail failed to load
+    if not image.isNull():
 
         # scale it down to fit inside a frame of maximum 512x512
-        thumb_scaled = thumb.scaled(CANVAS_WIDTH,
-                                    CANVAS_HEIGHT,
-                                    QtCore.Qt.KeepAspectRatio,
-                                    QtCore.Qt.SmoothTransformation)
+        thumb_img = _scale_thumbnail(image,
+                                     CANVAS_WIDTH,
+                                     CANVAS_HEIGHT)
 
         # now composite the thumbnail on top of the base image
         # bottom align it to make it look nice
-        thumb_img = thumb_scaled.toImage()
-        brush = QtGui.QBrush(thumb_img)
-
-        painter = QtGui.QPainter(base_image)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        painter.setBrush(brush)
+        painter = QtGui.QPainter(canvas)
 
         # figure out the offsets in order to center the thumb
-        height_difference = CANVAS_HEIGHT - thumb_scaled.height()
-        width_difference = CANVAS_WIDTH - thumb_scaled.width()
+        height_difference = CANVAS_HEIGHT - thumb_img.height()
+        width_difference = CANVAS_WIDTH - thumb_img.width()
 
         # center it horizontally
-        inlay_offset_w = (width_difference/2)+(CORNER_RADIUS/2)
+        inlay_offset_w = (width_difference//2)+(CORNER_RADIUS//2)
         # center it vertically
-        inlay_offset_h = (height_difference/2)+(CORNER_RADIUS/2)
+        inlay_offset_h = (height_difference//2)+(CORNER_RADIUS//2)
 
-        # note how we have to compensate for the corner radius
         painter.translate(inlay_offset_w, inlay_offset_h)
-        painter.drawRoundedRect(0,
-                                0,
-                                thumb_scaled.width()-CORNER_RADIUS,
-                                thumb_scaled.height()-CORNER_RADIUS,
-                                CORNER_RADIUS,
-                                CORNER_RADIUS)
+        _draw_rounded_thumbnail(painter, thumb_img, CORNER_RADIUS)
 
         painter.end()
 
-    return base_image
+    return QtGui.QPixmap.fromImage(canvas)
 
 
 def filter_publishes(app, sg_data_list):
@@ -272,11 +424,8 @@ def filter_publishes(app, sg_data_list):
             hook_publish_list = []
 
         # split back out publishes:
-        sg_data_list = []
-        for item in hook_publish_list:
-            sg_data = item.get("sg_publish")
-            if sg_data:
-                sg_data_list.append(sg_data)
+        sg_data_list = [item["sg_publish"] for item in hook_publish_list
+                        if item.get("sg_publish")]
 
     except:
         app.log_exception("Failed to execute 'filter_publishes_hook'!")
@@ -298,32 +447,63 @@ def resolve_filters(filters):
     """
     app = sgtk.platform.current_bundle()
 
+    # how to get the value for each of the supported context strings. Some of
+    # the context properties can end up querying Shotgun, so values are only
+    # looked up when a filter actually uses them.
+    context = app.context
+    context_tokens = {
+        "{context.entity}": lambda: context.entity,
+        "{context.step}": lambda: context.step,
+        "{context.project}": lambda: context.project,
+        "{context.project.id}": lambda: context.project.get("id") if context.project else None,
+        "{context.task}": lambda: context.task,
+        "{context.user}": lambda: context.user,
+    }
+
+    return _resolve_filters(filters, context_tokens)
+
+
+def _resolve_filters(filters, context_tokens):
+    """
+    Resolves the context strings found in a list of filters, including the
+    ones in any nested complex filters.
+
+    Nested filter groups are queued up and processed in turn rather than
+    recursing, so the context tokens only need setting up once per call to
+    resolve_filters().
+
+    :param filters: A list of filters, see resolve_filters().
+    :param dict context_tokens: Maps the supported context strings to
+        callables returning their value.
+    :return: A List of filters for use with the shotgun api
+    """
     resolved_filters = []
-    for filter in filters:
-        if type(filter) is dict:
-            resolved_filter = {
-                "filter_operator": filter["filter_operator"],
-                "filters": resolve_filters(filter["filters"])}
-        else:
-            resolved_filter = []
-            for field in filter:
-                if field == "{context.entity}":
-                    field = app.context.entity
-                elif field == "{context.step}":
-                    field = app.context.step
-                elif field == "{context.project}":
-                    field = app.context.project
-                elif field == "{context.project.id}":
-                    if app.context.project:
-                        field = app.context.project.get("id")
-                    else:
-                        field = None
-                elif field == "{context.task}":
-                    field = app.context.task
-                elif field == "{context.user}":
-                    field = app.context.user
-                resolved_filter.append(field)
-        resolved_filters.append(resolved_filter)
+
+    # filters still to resolve, paired with the list their resolved
+    # version should be added to
+    pending = deque([(filters, resolved_filters)])
+    while pending:
+        filters, resolved_group = pending.popleft()
+        for filter in filters:
+            # plain [field, operator, value] filters are by far the most
+            # common, so check for those first.
+            if filter.__class__ is not dict:
+                resolved_filter = []
+                for field in filter:
+                    # context tokens are always strings; anything else, such as
+                    # the list passed to an 'in' filter, is passed through as is.
+                    if isinstance(field, _STRING_TYPES):
+                        resolve_token = context_tokens.get(field)
+                        if resolve_token:
+                            field = resolve_token()
+                    resolved_filter.append(field)
+            else:
+                resolved_filter = {
+                    "filter_operator": filter["filter_operator"],
+                    "filters": []}
+                pending.append((filter["filters"], resolved_filter["filters"]))
+            resolved_group.append(resolved_filter)
+
     return resolved_filters
 
 
@@ -341,42 +521,72 @@ def sequence_range_from_path(path):
     :returns: None if no range could be determined, otherwise (min, max)
     :rtype: tuple or None
     """
-    # This pattern will match the following at the end of a string and
-    # retain the frame number or frame token as group(1) in the resulting
-    # match object:
-    #
-    # 0001
-    # ####
-    # %04d
-    #
-    # The number of digits or hashes does not matter; we match as many as
-    # exist.
-    frame_pattern = re.compile(r"([0-9#]+|[%]0\dd)$")
     root, ext = os.path.splitext(path)
-    match = re.search(frame_pattern, root)
+    match = _FRAME_PATTERN.search(root)
 
     # If we did not match, we don't know how to parse the file name, or there
     # is no frame number to extract.
     if not match:
         return None
 
-    # We need to get all files that match the pattern from disk so that we
-    # can determine what the min and max frame number is.
-    glob_path = "%s%s" % (
-        re.sub(frame_pattern, "*", root),
-        ext,
-    )
-    files = glob.glob(glob_path)
+    # Everything ahead of the frame number is shared by all the files of the
+    # sequence, and so is the extension. Scan the folder for files of that
+    # shape to determine what the min and max frame number is.
+    dirname, prefix = os.path.split(root[:match.start()])
+    return _frame_range_from_dir(dirname, prefix, ext)
+
+
+def _frame_range_from_dir(dirname, prefix, suffix, padding=0):
+    """
+    Looks for files named <prefix><frame number><suffix> in a folder
+    and returns the range of frame numbers found.
+
+    This is a single pass over the folder listing, checking each name
+    directly rather than globbing and then parsing every match again.
+    Only the names are needed, so no files are stat'ed, which makes a big
+    difference for long sequences on network storage.
+
+    :param str dirname: Folder to look in.
+    :param str prefix: File name part ahead of the frame number.
+    :param str suffix: File name part following the frame number.
+    :param int padding: Minimum number of digits a frame number must have.
+        Shorter frame numbers are ignored.
+
+    :returns: None if no frames were found, otherwise (min, max)
+    :rtype: tuple or None
+    """
+    try:
+        file_names = os.listdir(dirname or os.curdir)
+    except OSError:
+        return None
 
-    # Our pattern from above matches against the file root, so we need
-    # to chop off the extension at the end.
-    file_roots = [os.path.splitext(f)[0] for f in files]
+    # file names are matched case insensitively on Windows
+    prefix = os.path.normcase(prefix)
+    suffix = os.path.normcase(suffix)
+    frame_start = len(prefix)
+
+    min_frame = max_frame = None
+    for file_name in file_names:
+        file_name = os.path.normcase(file_name)
+        if not (file_name.startswith(prefix) and file_name.endswith(suffix)):
+            continue
+
+        # only accept plain ascii digits; isdigit() is also true for
+        # characters such as superscripts, which int() can't convert.
+        frame = file_name[frame_start:len(file_name) - len(suffix)]
+        if not frame or frame.strip("0123456789") or len(frame) < padding:
+            continue
+
+        frame = int(frame)
+        if min_frame is None or frame < min_frame:
+            min_frame = frame
+        if max_frame is None or frame > max_frame:
+            max_frame = frame
+
+    if min_frame is None:
+        return None
 
-    # We know that the search will result in a match at this point, otherwise
-    # the glob wouldn't have found the file. We can search and pull group 1
-    # to get the integer frame number from the file root name.
-    frames = [int(re.search(frame_pattern, f).group(1)) for f in file_roots]
-    return min(frames), max(frames)
+    return min_frame, max_frame
 
 
 def find_sequence_range(tk, path):
@@ -410,18 +620,151 @@ def find_sequence_range(tk, path):
         # so fall back on path parsing
         return sequence_range_from_path(path)
 
+    # If the frame number is the only thing that varies between the files
+    # of the sequence, find them with a single pass over the folder rather
+    # than having the template system glob and then parse every frame.
+    if "eye" not in template.keys:
+        frame_range = _sequence_range_from_template(template, fields)
+        if frame_range is not None:
+            return frame_range
+
     files = tk.paths_from_template(template, fields, ["SEQ", "eye"])
 
-    # find frame numbers from these files:
-    frames = []
+    # find the range of frame numbers from these files:
+    min_frame = max_frame = None
     for file in files:
-        fields = template.get_fields(file)
-        frame = fields.get("SEQ")
-        if frame != None:
-            frames.append(frame)
-    if not frames:
+        frame = template.get_fields(file).get("SEQ")
+        if frame is None:
+            continue
+        if min_frame is None or frame < min_frame:
+            min_frame = frame
+        if max_frame is None or frame > max_frame:
+            max_frame = frame
+
+    if min_frame is None:
         return None
 
     # return the range
-    return min(frames), max(frames)
+    return min_frame, max_frame
+
+
+def _sequence_range_from_template(template, fields):
+    """
+    Determines the frame range of a sequence by resolving the template's
+    SEQ key to a frame spec and scanning the folder for matching files.
+
+    :param template: Template matching the sequence path.
+    :param dict fields: Fields extracted from the sequence path.
+    :returns: None if no range could be determined this way, otherwise
+              (min, max)
+    """
+    seq_fields = dict(fields)
+    seq_fields["SEQ"] = "FORMAT: %d"
+    try:
+        seq_path = template.apply_fields(seq_fields)
+    except TankError:
+        return None
+
+    # only handle the case where the frame spec shows up once, in the file
+    # name. Anything more elaborate is left to the template system.
+    dirname, file_name = os.path.split(seq_path)
+    matches = list(_FRAME_SPEC_PATTERN.finditer(file_name))
+    if len(matches) != 1 or "%" in dirname:
+        return None
 
+    # honour the key's padding the same way the template system would, so
+    # e.g. shot.12.exr doesn't count as a frame of shot.%04d.exr
+    match = matches[0]
+    padding = int(match.group(1)) if match.group(1) else 0
+    return _frame_range_from_dir(
+        dirname,
+        file_name[:match.start()],
+        file_name[match.end():],
+        padding
+    )
+
+
+def sequence_range_from_path_async(path, callback):
+    """
+    Asynchronous version of :meth:`sequence_range_from_path`.
+
+    Listing the sequence folder can take a while on network storage, so the
+    scan is run on the global QThreadPool instead of blocking the UI. Several
+    scans can be in flight at once.
+
+    This needs to be called from a thread running a Qt event loop, typically
+    the main thread. The callback is invoked in that same thread once the
+    scan has finished.
+
+    :param str path: The file path to parse.
+    :param callback: Callable taking the path and the resulting frame range,
+                     which is None if no range could be determined, otherwise
+                     (min, max).
+    """
+    app = sgtk.platform.current_bundle()
+
+    notifier = _SequenceRangeNotifier(path, callback)
+    # keep the notifier alive until the result has been delivered
+    _PENDING_SEQUENCE_SCANS.add(notifier)
+    QtCore.QThreadPool.globalInstance().start(
+        _SequenceRangeRunnable(app, path, notifier)
+    )
+
+
+class _SequenceRangeNotifier(QtCore.QObject):
+    """
+    Hands the result of a background sequence scan back to the
+    thread the scan was requested from.
+    """
+    completed = QtCore.Signal(object)
+
+    def __init__(self, path, callback):
+        """
+        :param str path: The file path being scanned.
+        :param callback: Callable to pass the path and frame range to.
+        """
+        super(_SequenceRangeNotifier, self).__init__()
+        self._path = path
+        self._callback = callback
+        # queue the signal so that the callback always runs in the thread
+        # owning this object, whichever thread it is emitted from.
+        self.completed.connect(self._on_completed, QtCore.Qt.QueuedConnection)
+
+    def _on_completed(self, frame_range):
+        """
+        Called in the requesting thread once the scan is done.
+
+        :param frame_range: None or (min, max)
+        """
+        _PENDING_SEQUENCE_SCANS.discard(self)
+        self._callback(self._path, frame_range)
+
+
+class _SequenceRangeRunnable(QtCore.QRunnable):
+    """
+    Runs :meth:`sequence_range_from_path` in a QThreadPool worker thread.
+    """
+
+    def __init__(self, app, path, notifier):
+        """
+        :param app: The app to log errors through.
+        :param str path: The file path to parse.
+        :param notifier: _SequenceRangeNotifier to report the result to.
+        """
+        super(_SequenceRangeRunnable, self).__init__()
+        self._app = app
+        self._path = path
+        self._notifier = notifier
+
+    def run(self):
+        """
+        Scans for the sequence and emits the result.
+        """
+        try:
+            frame_range = sequence_range_from_path(self._path)
+        except Exception:
+            self._app.log_exception(
+                "Failed to determine the frame range of '%s'!" % self._path)
+            # still report back so that the notifier gets released
+            frame_range = None
+        self._notifier.completed.emit(frame_range)